@@ -1,22 +1,49 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import json
 from datetime import datetime
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 import os
 from fpdf import FPDF
 import base64
+import glob
+import hashlib
 import io
+import numpy as np
 import random
+import sqlite3
+import tempfile
+import threading
+import time
+import types
+import uuid
 from dotenv import load_dotenv
 
 # Try to import OpenAI, will show error if not installed
 try:
-    from openai import OpenAI
+    from openai import APIConnectionError, OpenAI
     openai_available = True
 except ImportError:
     openai_available = False
     st.error("OpenAI package not installed. Run: pip install openai")
 
+# Optional on-device transcription; the Whisper API is used when it is missing
+try:
+    from faster_whisper import WhisperModel
+    local_whisper_available = True
+except ImportError:
+    local_whisper_available = False
+
+# Use orjson for the stored evaluations and GPT responses when it is installed
+try:
+    import orjson
+    load_json = orjson.loads
+    def dump_json(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    load_json = json.loads
+    dump_json = json.dumps
+
 # Load environment variables from .env file (for local development)
 load_dotenv()
 
@@ -60,22 +87,81 @@ if not api_key:
         else:
             st.warning("⚠️ No API key found. Running in demo mode with simulated responses.")
 
-# Initialize OpenAI client if API key is available
-openai_client = None
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key):
+    """Create the OpenAI client once per API key and reuse it across reruns"""
+    return OpenAI(api_key=api_key)
+
+# faster-whisper model size for on-device transcription (tiny, base, small, ...)
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+
+@st.cache_resource(show_spinner="Loading local Whisper model...")
+def get_whisper_model(model_size=LOCAL_WHISPER_MODEL):
+    """Load the local Whisper model once per process, quantized for the available hardware"""
+    import ctranslate2
+    
+    if ctranslate2.get_cuda_device_count() > 0:
+        model = WhisperModel(model_size, device="cuda", compute_type="float16")
+    else:
+        model = WhisperModel(model_size, device="cpu", compute_type="int8")
+    
+    # A second of silence primes the decoder so the first real answer isn't slow
+    segments, _ = model.transcribe(np.zeros(16000, dtype=np.float32))
+    list(segments)
+    return model
+
+@st.cache_resource(show_spinner=False)
+def warm_up_local_whisper():
+    """Start loading the local Whisper model in the background, once per process; returns a Future"""
+    return get_background_executor().submit(get_whisper_model)
+
+# Requests per minute allowed by the OpenAI account tier
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+
+class RequestThrottle:
+    """Proactively limit OpenAI requests to a per-minute budget"""
+    
+    def __init__(self, rpm_limit):
+        # One permit every 60 / rpm seconds, with up to a second's worth held for bursts
+        self.interval = 60 / max(1, rpm_limit)
+        self._permits = threading.BoundedSemaphore(max(1, rpm_limit // 60))
+        threading.Thread(target=self._refill, daemon=True).start()
+    
+    def _refill(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._permits.release()
+            except ValueError:
+                pass  # Bucket is already full
+    
+    def acquire(self):
+        self._permits.acquire()
+
+@st.cache_resource(show_spinner=False)
+def get_request_throttle(rpm_limit=OPENAI_RPM_LIMIT):
+    """Share one throttle between all sessions and worker threads"""
+    return RequestThrottle(rpm_limit)
+
+@st.cache_resource(show_spinner=False)
+def get_background_executor():
+    """Shared worker pool for jobs that must not block the script thread"""
+    return ThreadPoolExecutor(max_workers=2)
+
+# Seconds before a key check that failed on the network is tried again
+KEY_CHECK_RETRY_SECONDS = 30
+
+@st.cache_resource(show_spinner=False)
+def validate_api_key(api_key):
+    """Check the API key off the script thread; returns (start time, Future)"""
+    client = get_openai_client(api_key)
+    return time.monotonic(), get_background_executor().submit(client.models.list)
+
+# The key is checked in the background (see validate_api_key); transcription
+# and evaluation already fall back to demo responses when a request fails.
 if api_key and api_key.startswith("sk-") and openai_available:
-    try:
-        openai_client = OpenAI(api_key=api_key)
-        # Test the connection
-        openai_client.models.list()
-        api_configured = True
-        st.session_state.openai_client = openai_client
-        st.session_state.api_configured = True
-       
-            
-    except Exception as e:
-        st.error(f"OpenAI API configuration failed: {str(e)[:100]}")
-        api_configured = False
-        openai_client = None
+    api_configured = True
+    st.session_state.api_configured = True
 elif api_key and not api_key.startswith("sk-"):
     st.warning("⚠️ Invalid OpenAI API key format. Should start with 'sk-'. Running in demo mode.")
     api_configured = False
@@ -84,241 +170,344 @@ else:
         st.error("OpenAI package not installed. Install with: pip install openai")
     api_configured = False
 
-# Initialize session state
-if 'progress' not in st.session_state:
-    st.session_state.progress = {
+# ========== PROGRESS STORAGE ==========
+PROGRESS_DIR = os.getenv("PROGRESS_DIR", os.path.join(tempfile.gettempdir(), "ai_interview_progress"))
+# Stores nobody has written to for this long are deleted
+PROGRESS_MAX_AGE_DAYS = float(os.getenv("PROGRESS_MAX_AGE_DAYS", "30"))
+
+@st.cache_resource(show_spinner=False, ttl=86400)
+def prune_progress_files():
+    """Create PROGRESS_DIR and delete stale session stores; runs at most once a day per process"""
+    os.makedirs(PROGRESS_DIR, exist_ok=True)
+    cutoff = time.time() - PROGRESS_MAX_AGE_DAYS * 86400
+    for path in glob.glob(os.path.join(PROGRESS_DIR, "progress_*.db")):
+        files = [path, path + "-wal", path + "-shm"]
+        try:
+            if max(os.path.getmtime(f) for f in files if os.path.exists(f)) >= cutoff:
+                continue
+            for f in files:
+                if os.path.exists(f):
+                    os.remove(f)
+        except (OSError, ValueError):
+            continue
+        progress_store.clear(os.path.basename(path)[len("progress_"):-len(".db")])
+    return True
+
+def get_session_id():
+    """Stable id for this browser session, kept in the URL so reloads keep progress"""
+    # Anyone holding the ?sid= link can read and change that session's progress,
+    # so it works like a bearer token and shouldn't be shared
+    if 'session_id' not in st.session_state:
+        session_id = st.query_params.get("sid")
+        if not session_id or not session_id.isalnum():
+            session_id = uuid.uuid4().hex
+            st.query_params["sid"] = session_id
+        st.session_state.session_id = session_id
+    return st.session_state.session_id
+
+@st.cache_resource(show_spinner=False, max_entries=100)
+def progress_store(session_id):
+    """SQLite store holding a session's evaluated answers"""
+    prune_progress_files()
+    conn = sqlite3.connect(
+        os.path.join(PROGRESS_DIR, f"progress_{session_id}.db"),
+        check_same_thread=False,
+        isolation_level=None
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS eval(qid INT PRIMARY KEY, score INT, answer TEXT, eval TEXT)")
+    return conn
+
+def new_progress():
+    """Empty progress dict with running totals for the sidebar stats"""
+    return {
         'completed': [],
         'scores': {},
         'answers': {},
         'transcripts': {},
-        'evaluations': {}
+        'evaluations': {},
+        '_agg': {'total': 0, 'count': 0, 'completed': 0, 'attempted': 0},
+        '_version': 0
     }
 
+def load_progress(conn):
+    """Rebuild the progress dict from the evaluations saved in the store"""
+    progress = new_progress()
+    agg = progress['_agg']
+    
+    for qid, score, answer, eval_json in conn.execute("SELECT qid, score, answer, eval FROM eval ORDER BY rowid"):
+        qid = str(qid)
+        progress['completed'].append(qid)
+        progress['scores'][qid] = score
+        progress['answers'][qid] = answer
+        progress['evaluations'][qid] = load_json(eval_json)
+        agg['total'] += score
+        agg['count'] += 1
+        agg['completed'] += 1
+        agg['attempted'] += 1
+    
+    return progress
+
+# Initialize session state
+if 'progress' not in st.session_state:
+    st.session_state.progress = load_progress(progress_store(get_session_id()))
+
 if 'api_configured' not in st.session_state:
     st.session_state.api_configured = api_configured
-if 'openai_client' not in st.session_state:
-    st.session_state.openai_client = openai_client
 
 # ========== QUESTIONS DATABASE ==========
-QUESTIONS = [
-    {
-        "id": 1,
-        "category": "Data Structures",
-        "question": "Explain the difference between an array and a linked list.",
-        "keywords": ["array", "linked list", "memory allocation", "access time", "insertion", "deletion"],
-        "ideal_length": "250-500 words",
-        "difficulty": "Medium",
-        "demo_transcripts": [
-            "Arrays and linked lists are both linear data structures but differ significantly in memory allocation. Arrays use contiguous memory blocks, allowing O(1) access time but making insertions/deletions expensive at O(n). Linked lists use non-contiguous memory with pointers, providing O(1) insertions/deletions but O(n) access time. Arrays have fixed size while linked lists are dynamic.",
-            "The key difference lies in memory organization. Arrays allocate contiguous memory, making cache utilization efficient but resizing costly. Linked lists use scattered memory with nodes containing data and next pointers, enabling efficient insertions but poor cache locality. Arrays support random access; linked lists require sequential traversal."
-        ]
-    },
-    {
-        "id": 2,
-        "category": "Algorithms",
-        "question": "What is the time complexity of binary search and how does it work?",
-        "keywords": ["binary search", "time complexity", "O(log n)", "sorted array", "divide and conquer"],
-        "ideal_length": "100-200 words",
-        "difficulty": "Easy",
-        "demo_transcripts": [
-            "Binary search has O(log n) time complexity. It works by repeatedly dividing a sorted array in half. You start with the middle element - if it matches the target, you're done. If the target is smaller, search the left half; if larger, search the right half. Continue until found or the search space is empty. It requires the array to be sorted.",
-            "Binary search operates in O(log n) time. The algorithm compares the target value to the middle element of a sorted array. Based on comparison, it eliminates half of the remaining elements. This divide-and-conquer approach dramatically reduces search time compared to linear search's O(n)."
-        ]
-    },
-    {
-        "id": 3,
-        "category": "System Design",
-        "question": "How would you design a URL shortening service like bit.ly?",
-        "keywords": ["hash function", "database", "scalability", "cache", "redirect", "unique ID"],
-        "ideal_length": "300-500 words",
-        "difficulty": "Hard",
-        "demo_transcripts": [
-            "A URL shortener needs several components: a unique ID generator using hash functions like Base62, a database to map short codes to original URLs, a caching layer like Redis for frequent URLs, and a redirect service. The system must handle high traffic, ensure collision-free hashing, and provide analytics. Considerations include scalability, cache invalidation, and monitoring.",
-            "Key components include: 1) Encoding service that converts long URLs to short codes using hash algorithms, 2) Database storage for mappings, 3) Cache for popular URLs, 4) Redirect service with 301/302 responses, 5) Analytics tracking. Design considerations: load balancing, database sharding, CDN usage, and rate limiting."
-        ]
-    },
-    {
-        "id": 4,
-        "category": "Algorithms",
-        "question": "Explain how a hash table works and its time complexity.",
-        "keywords": ["hash function", "collision", "bucket", "load factor", "O(1)", "chaining"],
-        "ideal_length": "150-300 words",
-        "difficulty": "Medium",
-        "demo_transcripts": [
-            "Hash tables map keys to values using a hash function that converts keys to array indices. They offer average O(1) time for insert, delete, and search operations. Collisions occur when different keys hash to the same index, resolved via chaining (linked lists) or open addressing. Load factor triggers resizing to maintain efficiency.",
-            "A hash table uses a hash function to compute an index into an array of buckets. Ideally, this provides O(1) average-case complexity. Collision resolution methods include separate chaining and open addressing. Performance degrades with high load factor, requiring rehashing. Good hash functions distribute keys uniformly."
-        ]
-    },
-    {
-        "id": 5,
-        "category": "Data Structures",
-        "question": "What are the differences between a stack and a queue?",
-        "keywords": ["LIFO", "FIFO", "operations", "use cases", "implementation"],
-        "ideal_length": "100-200 words",
-        "difficulty": "Easy",
-        "demo_transcripts": [
-            "Stacks follow LIFO (Last-In-First-Out) with push/pop operations, used for function calls, undo operations, and parsing. Queues follow FIFO (First-In-First-Out) with enqueue/dequeue operations, used for task scheduling, BFS, and messaging systems. Both can be implemented using arrays or linked lists with different access patterns.",
-            "Key difference: access order. Stack is LIFO - last element added is first removed. Queue is FIFO - first element added is first removed. Common stack operations: push, pop, peek. Queue operations: enqueue, dequeue, front. Stacks for recursion/backtracking, queues for breadth-first processing."
-        ]
-    },
-    {
-        "id": 6,
-        "category": "System Design",
-        "question": "Describe how you would design a simple chat application.",
-        "keywords": ["real-time", "websockets", "database", "scalability", "message queue", "authentication"],
-        "ideal_length": "250-400 words",
-        "difficulty": "Hard",
-        "demo_transcripts": [
-            "A chat app requires: 1) WebSocket connections for real-time communication, 2) Message broker for distribution, 3) Database for message persistence, 4) Authentication service, 5) Notification service for offline users. Design considerations: connection management, message ordering, read receipts, typing indicators, and media handling.",
-            "Core components include: client-server WebSocket connections, message queue (Kafka/RabbitMQ) for decoupling, database (SQL for users, NoSQL for messages), caching for active sessions, and push notification service. Must handle concurrent connections, message delivery guarantees, and presence tracking."
-        ]
-    },
-    {
-        "id": 7,
-        "category": "Behavioral",
-        "question": "Tell me about a challenging project you worked on and how you overcame obstacles.",
-        "keywords": ["challenge", "solution", "teamwork", "learning", "results"],
-        "ideal_length": "200-350 words",
-        "difficulty": "Medium",
-        "demo_transcripts": [
-            "I worked on a legacy system migration with tight deadlines. Challenges included undocumented APIs and team knowledge gaps. I overcame this by creating detailed documentation, pairing with senior engineers, and implementing incremental migration with feature flags. The project completed on time with zero downtime.",
-            "The most challenging project involved optimizing database queries that were causing performance issues. I systematically analyzed query patterns, implementing indexing strategies, introduced caching, and refactored inefficient joins. Through careful monitoring and A/B testing, we achieved 70% performance improvement."
-        ]
-    },
-    {
-        "id": 8,
-        "category": "Algorithms",
-        "question": "What is dynamic programming and when would you use it?",
-        "keywords": ["memoization", "optimal substructure", "overlapping subproblems", "Fibonacci", "examples"],
-        "ideal_length": "150-250 words",
-        "difficulty": "Medium",
-        "demo_transcripts": [
-            "Dynamic programming solves complex problems by breaking them into overlapping subproblems and storing solutions to avoid recomputation. It applies when problems have optimal substructure and overlapping subproblems. Examples: Fibonacci sequence, knapsack problem, shortest path algorithms. Techniques include memoization (top-down) and tabulation (bottom-up).",
-            "DP optimizes recursive solutions by caching intermediate results. Use it for problems where the same subproblems recur, like calculating Fibonacci numbers or finding the longest common subsequence. The key insight is trading space for time by storing computed results in a table or dictionary."
-        ]
-    },
-    {
-        "id": 9,
-        "category": "Data Structures",
-        "question": "Compare and contrast B-trees and binary search trees.",
-        "keywords": ["balanced", "height", "disk access", "database indexing", "nodes", "children"],
-        "ideal_length": "150-250 words",
-        "difficulty": "Hard",
-        "demo_transcripts": [
-            "B-trees are balanced m-way trees optimized for disk access, with nodes containing multiple keys and children. Binary search trees are binary trees with at most two children per node. B-trees minimize disk I/O by having larger node sizes matching disk blocks, while BSTs are memory-optimized. B-trees auto-balance, BSTs may become unbalanced.",
-            "Key differences: B-trees have multiple keys per node and maintain balance automatically, making them ideal for databases and file systems. BSTs have one key per node and can degrade to O(n) if unbalanced. B-trees have lower height, reducing disk accesses for large datasets stored externally."
-        ]
-    },
-    {
-        "id": 10,
-        "category": "Behavioral",
-        "question": "How do you handle conflicts when working in a team?",
-        "keywords": ["communication", "compromise", "perspective", "resolution", "professionalism"],
-        "ideal_length": "150-250 words",
-        "difficulty": "Medium",
-        "demo_transcripts": [
-            "I handle conflicts through open communication, focusing on issues not people. First, I listen to understand all perspectives. Then, I facilitate discussion to find common ground, proposing data-driven solutions. If needed, I escalate to a manager. The goal is constructive resolution that strengthens the team, not winning arguments.",
-            "My approach: 1) Address issues early before escalation, 2) Focus on facts and project goals, 3) Seek compromise through brainstorming alternatives, 4) Document agreements, 5) Follow up to ensure resolution. I believe diverse perspectives strengthen outcomes when managed constructively."
-        ]
+QUESTIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.json")
+
+# cache_resource hands every caller the same objects instead of unpickling a copy
+# per call, so these results are shared and must be treated as read-only
+@st.cache_resource(show_spinner=False)
+def load_questions():
+    """Load the interview questions from questions.json once per process"""
+    with open(QUESTIONS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+@st.cache_resource(show_spinner=False)
+def questions_by_id():
+    """Map question id -> question for O(1) lookups"""
+    return {q["id"]: q for q in load_questions()}
+
+@st.cache_resource(show_spinner=False)
+def question_option_labels():
+    """Labels for the practice page question selector"""
+    return tuple(f"Q{q['id']}: {q['question'][:50]}..." for q in load_questions())
+
+@st.cache_resource(show_spinner=False)
+def question_excerpts():
+    """Truncated question text used by the dashboard and report, keyed by id then length"""
+    return {
+        q["id"]: {length: q["question"][:length] + "..." for length in (40, 50, 70)}
+        for q in load_questions()
     }
-]
+
+QUESTIONS = load_questions()
+
+# Fallback demo transcripts for questions without their own
+_CATEGORY_DEFAULT = {
+    "Data Structures": "Data structures organize and store data efficiently. Different structures optimize for different operations like access, insertion, or deletion.",
+    "Algorithms": "Algorithms are step-by-step procedures for solving problems. Time and space complexity analysis helps compare algorithm efficiency.",
+    "System Design": "System design involves creating scalable, reliable architectures. Key considerations include load balancing, caching, database choice, and fault tolerance.",
+    "Behavioral": "Behavioral questions assess soft skills and experience. Use the STAR method (Situation, Task, Action, Result) to structure responses.",
+}
+_DEFAULT_DEMO_TRANSCRIPT = "This is a demo transcript for a technical interview question."
+
+@st.cache_resource(show_spinner=False)
+def demo_transcripts_by_id():
+    """Read-only map of question id -> tuple of demo transcripts, built once per process"""
+    return types.MappingProxyType({
+        q["id"]: tuple(q.get("demo_transcripts") or (_CATEGORY_DEFAULT.get(q["category"], _DEFAULT_DEMO_TRANSCRIPT),))
+        for q in load_questions()
+    })
+
+DEMO_TRANSCRIPTS = demo_transcripts_by_id()
+
+@st.cache_resource(show_spinner=False)
+def demo_rng():
+    """RNG for demo responses, seeded once instead of sharing the global one"""
+    return random.Random()
 
 # ========== HELPER FUNCTIONS ==========
+def track_question_key(qid, key):
+    """Register a session_state key as owned by a question and return it"""
+    st.session_state.setdefault('_qkeys', {}).setdefault(str(qid), set()).add(key)
+    return key
+
 def clear_question_data(qid):
     """Clear UI state for a specific question"""
-    keys_to_clear = []
-    
-    for key in list(st.session_state.keys()):
-        if key.startswith(f'audio_transcript_{qid}') or \
-           key.startswith(f'text_answer_{qid}') or \
-           key.startswith(f'last_audio_{qid}') or \
-           key.startswith(f'audio_input_{qid}') or \
-           key.startswith(f'audio_uploaded_{qid}') or \
-           key.startswith(f'audio_recorder_{qid}') or \
-           key.startswith(f'transcript_display_{qid}') or \
-           key.startswith(f'record_count_{qid}') or \
-           key.startswith(f'recording_active_{qid}') or \
-           key.startswith(f'audio_data_{qid}'):
-            keys_to_clear.append(key)
-    
-    keys_to_clear = list(set(keys_to_clear))
-    for key in keys_to_clear:
-        try:
-            del st.session_state[key]
-        except:
-            pass
+    for key in st.session_state.get('_qkeys', {}).pop(str(qid), ()):
+        st.session_state.pop(key, None)
     
     # Clear from progress tracking
     progress = st.session_state.progress
+    agg = progress['_agg']
     qid_str = str(qid)
     
     if qid_str in progress['answers']:
         del progress['answers'][qid_str]
+        agg['attempted'] -= 1
+        progress['_version'] += 1
+        st.session_state.pop('stats', None)
     if qid_str in progress['scores']:
-        del progress['scores'][qid_str]
+        agg['total'] -= progress['scores'].pop(qid_str)
+        agg['count'] -= 1
+        st.session_state.pop('stats', None)
     if qid_str in progress['completed']:
         progress['completed'] = [q for q in progress['completed'] if q != qid_str]
+        agg['completed'] -= 1
     if qid_str in progress['transcripts']:
         del progress['transcripts'][qid_str]
     if qid_str in progress['evaluations']:
         del progress['evaluations'][qid_str]
     
+    progress_store(get_session_id()).execute("DELETE FROM eval WHERE qid = ?", (int(qid_str),))
+    
     return True
 
+def reset_question(qid):
+    """Button callback: clear one question's answer, audio and evaluation"""
+    if clear_question_data(qid):
+        st.toast(f"Question {qid} reset successfully!")
+
+# Session keys that survive "Reset All Progress"
+RESET_KEEP_KEYS = frozenset({'api_configured', 'page', 'progress', 'session_id'})
+
 def reset_all_progress():
     """Reset ALL progress including stored answers"""
-    st.session_state.progress = {
-        'completed': [],
-        'scores': {},
-        'answers': {},
-        'transcripts': {},
-        'evaluations': {}
-    }
-    
-    keys_to_clear = [k for k in st.session_state.keys() if k not in [
-        'api_configured', 'openai_client', 'page', 'progress'
-    ]]
+    st.session_state.progress = new_progress()
+    progress_store(get_session_id()).execute("DELETE FROM eval")
     
-    for key in keys_to_clear:
-        try:
-            del st.session_state[key]
-        except:
-            pass
+    for key in [k for k in st.session_state.keys() if k not in RESET_KEEP_KEYS]:
+        st.session_state.pop(key, None)
     
+    st.toast("All progress cleared!")
     return True
 
+def save_answer(qid, answer):
+    """Store an answer in progress, keeping the attempted count current"""
+    progress = st.session_state.progress
+    if qid not in progress['answers']:
+        progress['_agg']['attempted'] += 1
+        progress['_version'] += 1
+    if progress['answers'].get(qid) != answer:
+        st.session_state.pop('stats', None)
+    progress['answers'][qid] = answer
+
+def answered_qids():
+    """Answered question ids in numeric order, re-sorted only when the set of answers changes"""
+    progress = st.session_state.progress
+    cached = st.session_state.get('_answered_qids')
+    if cached is None or cached[0] != progress['_version']:
+        cached = (progress['_version'], sorted(progress['answers'], key=int))
+        st.session_state._answered_qids = cached
+    return cached[1]
+
+def record_evaluation(qid, answer, ai_eval):
+    """Store an AI evaluation for a question in progress and return its eval data"""
+    progress = st.session_state.progress
+    agg = progress['_agg']
+    save_answer(qid, answer)
+    
+    if qid not in progress['completed']:
+        progress['completed'].append(qid)
+        agg['completed'] += 1
+    if qid in progress['scores']:
+        agg['total'] -= progress['scores'][qid]
+    else:
+        agg['count'] += 1
+    progress['scores'][qid] = ai_eval['score']
+    agg['total'] += ai_eval['score']
+    st.session_state.pop('stats', None)
+    
+    eval_data = {
+        'overall_score': ai_eval['score'],
+        'word_count': word_count(answer),
+        'feedback': ai_eval
+    }
+    # Only a real GPT score may short-circuit later clicks; demo or fallback results must stay retryable
+    if not ai_eval.get('demo'):
+        eval_data['answer_hash'] = answer_digest(answer)
+    
+    st.session_state[track_question_key(qid, f'evaluation_{qid}')] = eval_data
+    progress['evaluations'][qid] = eval_data
+    
+    progress_store(get_session_id()).execute(
+        "INSERT OR REPLACE INTO eval(qid, score, answer, eval) VALUES (?, ?, ?, ?)",
+        (int(qid), ai_eval['score'], answer, dump_json(eval_data))
+    )
+    return eval_data
+
+# Score distribution buckets shown in the report (the last one includes 100)
+SCORE_BINS = (0, 20, 40, 60, 80, 101)
+
+def answer_digest(answer):
+    """Short stable hash of an answer's text, used to spot unchanged answers"""
+    return hashlib.blake2b(answer.encode("utf-8"), digest_size=8).hexdigest()
+
+def word_count(text):
+    """Number of whitespace-separated words in text"""
+    stripped = text.strip()
+    # Single-spaced ASCII text (the usual transcript) can count separators instead of building a word list
+    if stripped.isascii() and stripped.isprintable() and "  " not in stripped:
+        return stripped.count(" ") + 1 if stripped else 0
+    return len(stripped.split())
+
+def _recompute_stats(progress):
+    """Score aggregates and per-answer word counts for the current progress"""
+    scores = progress['scores']
+    scores_arr = np.fromiter(scores.values(), dtype=np.int16, count=len(scores))
+    return {
+        'scores_arr': scores_arr,
+        'count': len(scores_arr),
+        'avg': float(scores_arr.mean()) if len(scores_arr) else 0.0,
+        'max': int(scores_arr.max()) if len(scores_arr) else 0,
+        'min': int(scores_arr.min()) if len(scores_arr) else 0,
+        'distribution': np.histogram(scores_arr, bins=SCORE_BINS)[0].tolist(),
+        'word_counts': {qid: word_count(answer) for qid, answer in progress['answers'].items()}
+    }
+
+def progress_stats():
+    """Cached _recompute_stats result, rebuilt only after an answer or score changes"""
+    stats = st.session_state.get('stats')
+    if stats is None:
+        stats = st.session_state.stats = _recompute_stats(st.session_state.progress)
+    return stats
+
+def pending_audio_qids():
+    """Question ids with a recording that has not been transcribed yet"""
+    return [
+        qid for qid in st.session_state.get('_qkeys', {})
+        if st.session_state.get(f'last_audio_{qid}') is not None
+        and not st.session_state.get(f'audio_transcript_{qid}')
+    ]
+
 def get_audio_size(audio_data):
-    """Get size of audio data in KB, handling both UploadedFile and bytes"""
+    """Get size of recorded audio bytes in KB"""
     if audio_data is None:
         return 0
-    
-    if hasattr(audio_data, 'getvalue'):
-        return len(audio_data.getvalue()) // 1024
-    elif isinstance(audio_data, bytes):
-        return len(audio_data) // 1024
-    else:
-        return 0
+    return len(audio_data) >> 10
 
 def get_audio_bytes(audio_data):
-    """Extract bytes from audio data, handling both UploadedFile and bytes"""
-    if audio_data is None:
-        return None
-    
-    if hasattr(audio_data, 'getvalue'):
-        return audio_data.getvalue()
-    elif isinstance(audio_data, bytes):
+    """Return the recorded audio bytes, or None if nothing usable was stored"""
+    if isinstance(audio_data, bytes):
         return audio_data
-    else:
-        return None
+    return None
+
+def start_recording(qid):
+    """Button callback: show a fresh recorder widget for qid"""
+    st.session_state[f'recording_active_{qid}'] = True
+    st.session_state[f'record_count_{qid}'] += 1
+
+def cancel_recording(qid):
+    """Button callback: close the recorder without keeping anything"""
+    st.session_state[f'recording_active_{qid}'] = False
+
+def discard_audio(qid):
+    """Button callback: drop the recording for qid and any transcription started for it"""
+    st.session_state[f'last_audio_{qid}'] = None
+    st.session_state.pop(f'transcription_future_{qid}', None)
+    if f'recording_active_{qid}' in st.session_state:
+        st.session_state[f'recording_active_{qid}'] = False
+
+def rerecord_audio(qid):
+    """Button callback: replace the recording for qid with a new one"""
+    discard_audio(qid)
+    start_recording(qid)
+    for key in list(st.session_state.keys()):
+        if key.startswith(f'audio_recorder_{qid}'):
+            st.session_state.pop(key, None)
 
 def audio_recorder_component(question_id):
     """Custom audio recorder component"""
     qid = str(question_id)
     
     if f'recording_active_{qid}' not in st.session_state:
-        st.session_state[f'recording_active_{qid}'] = False
+        st.session_state[track_question_key(qid, f'recording_active_{qid}')] = False
     if f'record_count_{qid}' not in st.session_state:
-        st.session_state[f'record_count_{qid}'] = 0
+        st.session_state[track_question_key(qid, f'record_count_{qid}')] = 0
     
     st.write("### 🎤 Record Your Answer")
     
@@ -333,57 +522,62 @@ def audio_recorder_component(question_id):
         
         col_act1, col_act2 = st.columns(2)
         with col_act1:
-            if st.button("🔄 Re-record", 
-                       key=f"rerecord_main_{qid}",
-                       use_container_width=True,
-                       help="Record a new audio, replacing current one"):
-                st.session_state[last_audio_key] = None
-                st.session_state[f'recording_active_{qid}'] = True
-                st.session_state[f'record_count_{qid}'] += 1
-                for key in list(st.session_state.keys()):
-                    if key.startswith(f'audio_recorder_{qid}'):
-                        try:
-                            del st.session_state[key]
-                        except:
-                            pass
-                st.rerun()
+            st.button("🔄 Re-record", 
+                    key=f"rerecord_main_{qid}",
+                    use_container_width=True,
+                    help="Record a new audio, replacing current one",
+                    on_click=rerecord_audio,
+                    args=(qid,))
     
     elif st.session_state[f'recording_active_{qid}']:
         record_key = f"audio_recorder_{qid}_{st.session_state[f'record_count_{qid}']}"
         
         audio_bytes = st.audio_input(
             "Click to start/stop recording",
-            key=record_key
+            key=track_question_key(qid, record_key)
         )
         
         if audio_bytes is not None:
-            st.session_state[last_audio_key] = audio_bytes
+            # Copy the upload out once; later reruns only pass these immutable bytes around
+            audio_bytes = audio_bytes.getvalue()
+            st.session_state[track_question_key(qid, last_audio_key)] = audio_bytes
             st.session_state[f'recording_active_{qid}'] = False
+            start_background_transcription(qid, audio_bytes)
             st.success("✅ Recording complete!")
             st.rerun()
         
-        if st.button("❌ Cancel Recording", 
-                   key=f"cancel_record_{qid}",
-                   use_container_width=True,
-                   type="secondary"):
-            st.session_state[f'recording_active_{qid}'] = False
-            st.rerun()
+        st.button("❌ Cancel Recording", 
+                key=f"cancel_record_{qid}",
+                use_container_width=True,
+                type="secondary",
+                on_click=cancel_recording,
+                args=(qid,))
     
     else:
-        if st.button("🎤 Start Recording", 
-                    key=f"start_record_{qid}",
-                    use_container_width=True,
-                    type="primary"):
-            st.session_state[f'recording_active_{qid}'] = True
-            st.session_state[f'record_count_{qid}'] += 1
-            st.rerun()
+        st.button("🎤 Start Recording", 
+                key=f"start_record_{qid}",
+                use_container_width=True,
+                type="primary",
+                on_click=start_recording,
+                args=(qid,))
 
 def show_sidebar():
     with st.sidebar:
         st.title("⚙️ Configuration")
         
         if st.session_state.api_configured:
-            st.success("✅ OpenAI API Configured")
+            checked_at, key_check = validate_api_key(api_key) if api_key else (None, None)
+            if key_check is not None and not key_check.done():
+                st.info("⏳ Verifying OpenAI API key...")
+            elif key_check is not None and key_check.exception() is not None:
+                error = key_check.exception()
+                st.error(f"OpenAI API key check failed: {str(error)[:100]}")
+                # Network failures and timeouts are retried after a pause; a rejected
+                # key stays cached so it isn't re-checked on every rerun
+                if isinstance(error, APIConnectionError) and time.monotonic() - checked_at >= KEY_CHECK_RETRY_SECONDS:
+                    validate_api_key.clear(api_key)
+            else:
+                st.success("✅ OpenAI API Configured")
             if 'OPENAI_API_KEY' in st.secrets:
                 st.caption("API key loaded from Streamlit secrets")
             else:
@@ -395,15 +589,13 @@ def show_sidebar():
         st.divider()
         
         st.subheader("📊 Quick Stats")
-        progress = st.session_state.progress
-        completed = len(progress['completed'])
-        attempted = len(progress.get('answers', {}))
+        agg = st.session_state.progress['_agg']
         
-        st.metric("Questions Completed", f"{completed}/{len(QUESTIONS)}")
-        st.caption(f"Attempted: {attempted}")
+        st.metric("Questions Completed", f"{agg['completed']}/{len(QUESTIONS)}")
+        st.caption(f"Attempted: {agg['attempted']}")
         
-        if progress['scores']:
-            avg_score = sum(progress['scores'].values()) / len(progress['scores'])
+        if agg['count']:
+            avg_score = agg['total'] / agg['count']
             st.metric("Average Score", f"{avg_score:.1f}%")
         
         st.divider()
@@ -436,34 +628,81 @@ def show_sidebar():
         
         st.divider()
         
-        if st.button("🔄 Reset All Progress", use_container_width=True, type="secondary"):
-            if reset_all_progress():
-                st.success("All progress cleared!")
-                st.rerun()
+        st.button("🔄 Reset All Progress", 
+                 use_container_width=True, 
+                 type="secondary",
+                 on_click=reset_all_progress)
         
         st.divider()
         st.caption("💡 Tip: Record audio, then transcribe and evaluate for best results")
 
 def get_question_demo_transcript(question_id):
     """Get appropriate demo transcript for specific question"""
-    for q in QUESTIONS:
-        if q['id'] == question_id:
-            if 'demo_transcripts' in q and q['demo_transcripts']:
-                return random.choice(q['demo_transcripts'])
-            else:
-                category = q['category']
-                if category == "Data Structures":
-                    return "Data structures organize and store data efficiently. Different structures optimize for different operations like access, insertion, or deletion."
-                elif category == "Algorithms":
-                    return "Algorithms are step-by-step procedures for solving problems. Time and space complexity analysis helps compare algorithm efficiency."
-                elif category == "System Design":
-                    return "System design involves creating scalable, reliable architectures. Key considerations include load balancing, caching, database choice, and fault tolerance."
-                elif category == "Behavioral":
-                    return "Behavioral questions assess soft skills and experience. Use the STAR method (Situation, Task, Action, Result) to structure responses."
-    return "This is a demo transcript for a technical interview question."
-
-def transcribe_audio(audio_data, question_id=None):
-    """Transcribe audio using Whisper"""
+    transcripts = DEMO_TRANSCRIPTS.get(int(question_id), (_DEFAULT_DEMO_TRANSCRIPT,))
+    return demo_rng().choice(transcripts)
+
+def request_transcription(client, throttle, audio_bytes, placeholder=None):
+    """Send audio to Whisper and return the transcript text; raises on failure"""
+    throttle.acquire()
+    with client.audio.transcriptions.with_streaming_response.create(
+        model="whisper-1",
+        file=("answer.wav", audio_bytes, "audio/wav"),
+        response_format="text"
+    ) as response:
+        if placeholder is not None:
+            transcript_text = placeholder.write_stream(response.iter_text())
+        else:
+            transcript_text = response.text()
+    
+    return transcript_text.strip()
+
+def local_transcription(model, audio_bytes, placeholder=None):
+    """Transcribe audio on-device with faster-whisper; raises on failure"""
+    segments, _ = model.transcribe(io.BytesIO(audio_bytes))
+    pieces = (segment.text for segment in segments)
+    if placeholder is not None:
+        transcript_text = placeholder.write_stream(pieces)
+    else:
+        transcript_text = "".join(pieces)
+    
+    return transcript_text.strip()
+
+def start_background_transcription(qid, audio_data):
+    """Begin transcribing a fresh recording while the user reviews it"""
+    if local_whisper_available:
+        # Load the model inside the worker so a cold start never blocks the script thread
+        future = get_background_executor().submit(lambda: local_transcription(get_whisper_model(), audio_data))
+    elif st.session_state.api_configured and api_key:
+        future = get_background_executor().submit(
+            request_transcription, get_openai_client(api_key), get_request_throttle(), audio_data
+        )
+    else:
+        return
+    st.session_state[track_question_key(qid, f'transcription_future_{qid}')] = future
+
+def resolve_transcription(qid, audio_data, placeholder=None):
+    """Use the background transcription for qid if it succeeded, else transcribe now"""
+    future = st.session_state.pop(f'transcription_future_{qid}', None)
+    if future is not None:
+        try:
+            transcript = future.result()
+            if transcript:
+                if placeholder is not None:
+                    placeholder.write(transcript)
+                return transcript
+        except Exception:
+            pass  # Retry below, where errors are reported and fall back to demo text
+    return transcribe_audio(audio_data, int(qid), placeholder=placeholder)
+
+def transcribe_audio(audio_data, question_id=None, placeholder=None):
+    """Transcribe audio using Whisper, streaming text into placeholder if given"""
+    if local_whisper_available:
+        try:
+            return local_transcription(get_whisper_model(), audio_data, placeholder)
+        except Exception as e:
+            if not st.session_state.api_configured:
+                st.error(f"Local transcription error: {str(e)[:100]}")
+    
     if not st.session_state.api_configured:
         if question_id:
             return get_question_demo_transcript(question_id)
@@ -474,153 +713,416 @@ def transcribe_audio(audio_data, question_id=None):
         if audio_bytes is None:
             raise ValueError("No audio data found")
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-            tmp_file.write(audio_bytes)
-            tmp_path = tmp_file.name
-        
-        with open(tmp_path, "rb") as audio:
-            transcript = st.session_state.openai_client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio
-            )
-        
-        os.unlink(tmp_path)
-        return transcript.text
+        return request_transcription(get_openai_client(api_key), get_request_throttle(), audio_bytes, placeholder)
     except Exception as e:
         st.error(f"Transcription error: {str(e)[:100]}")
         if question_id:
             return get_question_demo_transcript(question_id)
         return "Error in transcription. Please try again."
 
-def evaluate_with_gpt(question, answer):
-    """Evaluate answer using GPT - Simplified and more accurate"""
+def map_in_threads(func, jobs, max_workers=8):
+    """Run func(*args) for each {key: args} concurrently and return {key: result}"""
+    ctx = get_script_run_ctx()
+    
+    def run_in_worker(args):
+        # Workers need the script context to reach session_state and st.error
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_in_worker, args): key for key, args in jobs.items()}
+        return {futures[future]: future.result() for future in as_completed(futures)}
+
+def transcribe_audio_batch(audio_blobs, max_workers=8):
+    """Transcribe {qid: audio} concurrently, one Whisper request per recording"""
+    jobs = {qid: (qid, audio_data) for qid, audio_data in audio_blobs.items()}
+    return map_in_threads(resolve_transcription, jobs, max_workers)
+
+# Static system prompt shared by every evaluation request. It is kept above
+# OpenAI's 1024-token prompt-caching threshold so repeat requests reuse it.
+EVALUATION_SYSTEM_PROMPT = """You are a realistic technical interviewer who evaluates candidates' spoken answers to interview questions. The answers were recorded by voice and transcribed automatically, so ignore filler words, repeated words, missing punctuation and small transcription errors. Judge what the candidate knows and how well they explain it, not the quality of the transcript. Score honestly based on answer quality and always respond in JSON.
+
+Each request gives you one or more answers. For every answer you receive the QUESTION, its CATEGORY, its DIFFICULTY, the KEY CONCEPTS an interviewer would expect to hear, and the STUDENT'S ANSWER.
+
+Provide a SINGLE overall score from 0-100 for each answer based on:
+1. Technical accuracy and correctness - statements must be true; a confident but wrong claim costs more than an omission
+2. Completeness - covering all key concepts; each missing key concept should lower the score
+3. Clarity and organization - a clear definition first, then details, trade-offs and examples
+4. Depth of understanding - explaining why, not only what; complexity analysis, edge cases and real-world use
+5. Conciseness - appropriate length for a spoken interview answer; rambling or padding lowers the score
+
+Scoring guidelines:
+- 90-100: Excellent - Comprehensive, accurate, well-structured; covers every key concept with examples or trade-offs
+- 80-89: Very Good - Solid understanding, minor improvements needed; most key concepts covered correctly
+- 70-79: Good - Understands concepts, needs more depth; correct but thin on examples, trade-offs or complexity
+- 60-69: Satisfactory - Basic understanding, some gaps; several key concepts missing or only named
+- 50-59: Needs Work - Significant gaps or inaccuracies; the core idea is only partly right
+- Below 50: Poor - Major issues or incomplete; mostly wrong, off-topic, or only a sentence or two
+
+Calibration rules:
+- Do not give a high score to an answer just because it is long. Length only helps when it adds correct content.
+- An answer that is one or two sentences long should score below 50 unless the question genuinely needs only that.
+- An answer that does not address the question, or is empty, should score below 20.
+- Do not reward keyword lists; a key concept counts only when the candidate explains it.
+- Scores for different answers must be independent. Never average answers together or compare them with each other.
+- Difficulty matters: a Hard question answered at a basic level is Satisfactory, not Good.
+
+Category guidance:
+- Data Structures: expect how the structure is laid out in memory, the time complexity of its core operations, and when to choose it over alternatives.
+- Algorithms: expect the idea of the algorithm, its time and space complexity, preconditions (for example sorted input), and a short walk-through or example.
+- System Design: expect requirements, the main components, how they scale, caching, storage choices, failure handling and the trade-offs between options.
+- Behavioral: expect a structured story (Situation, Task, Action, Result), the candidate's own actions, a measurable result and what they learned. Technical depth is not required.
+
+Feedback rules:
+- "strengths": 2-3 specific strengths, each naming something the candidate actually said.
+- "improvements": 2-3 specific areas for improvement, each naming a missing concept, an error to correct, or a concrete way to restructure the answer.
+- "feedback": 3-4 sentences with specific feedback addressed to the candidate as "you", ending with the single most valuable next step.
+- Never invent content the candidate did not say.
+
+Response format for a single answer, a JSON object:
+{"score": int 0-100, "strengths": ["..."], "improvements": ["..."], "feedback": "..."}
+
+Response format when several numbered answers are given, a JSON object with an "evaluations" array containing exactly one item per answer, in the same order as the answers:
+{"evaluations": [{"index": 1, "score": int 0-100, "strengths": ["..."], "improvements": ["..."], "feedback": "..."}]}
+
+Example of a strong answer:
+QUESTION: What is the difference between an array and a linked list?
+CATEGORY: Data Structures
+DIFFICULTY: Easy
+KEY CONCEPTS: Memory allocation, Access time, Insertion/Deletion, Cache locality
+STUDENT'S ANSWER: An array stores its elements in one contiguous block of memory, so you can jump to any index in constant time and iterating is cache friendly. The downside is that inserting or deleting in the middle means shifting everything after it, which is O(n), and growing it may need a copy. A linked list stores nodes anywhere in memory, each pointing to the next, so inserting or removing a node you already hold is O(1), but finding the i-th element is O(n) and the pointer chasing hurts cache locality. I'd use an array for read-heavy indexed data and a linked list for frequent insertions, like an LRU cache's eviction list.
+Response:
+{"score": 92, "strengths": ["Contrasts contiguous memory with scattered nodes and explains the effect on access time", "Gives correct complexities for access, insertion and deletion", "Mentions cache locality and a realistic use case (LRU cache)"], "improvements": ["Mention the extra memory each node spends on pointers", "Briefly note dynamic arrays' amortized O(1) append"], "feedback": "This is an excellent, well-organized answer. You covered memory layout, complexity and cache behaviour, and tied them to when you would choose each structure. Adding the pointer overhead of linked lists would make the trade-off complete. Keep using concrete examples like the LRU cache; interviewers value them."}
+
+Example of a weak answer:
+QUESTION: Explain how binary search works.
+CATEGORY: Algorithms
+DIFFICULTY: Easy
+KEY CONCEPTS: Sorted array, Divide and conquer, O(log n) time, Midpoint comparison
+STUDENT'S ANSWER: Binary search is a fast way to search. You look in the middle and keep going until you find it. It is faster than normal search.
+Response:
+{"score": 38, "strengths": ["Recognizes that the search starts at the middle element", "Knows binary search is faster than a linear scan"], "improvements": ["State that the input must be sorted", "Explain how half of the range is discarded after each comparison", "Give the O(log n) time complexity and compare it with O(n)"], "feedback": "Your answer has the right intuition but leaves out the details that make binary search work. You did not mention that the array must be sorted or how the search range is halved after comparing with the middle element. Without the O(log n) complexity the claim that it is faster is not justified. Next time, walk through a small example step by step."}"""
+
+
+# Routes every evaluation request to the same prompt cache
+EVALUATION_CACHE_KEY = "interview_eval"
+
+@st.cache_data(show_spinner=False)
+def prompt_prefix(qid):
+    """Question details for the user message of an evaluation request"""
+    question = questions_by_id()[qid]
+    return f"""QUESTION: {question['question']}
+CATEGORY: {question['category']}
+DIFFICULTY: {question['difficulty']}
+KEY CONCEPTS: {', '.join(question['keywords'])}"""
+
+def normalize_feedback(raw):
+    """Coerce GPT's JSON evaluation into score/strengths/improvements/feedback"""
+    try:
+        score = min(max(int(raw.get("score", 50)), 0), 100)
+    except (TypeError, ValueError):
+        score = 50
+    
+    strengths = raw.get("strengths") or []
+    improvements = raw.get("improvements") or []
+    if isinstance(strengths, str):
+        strengths = [strengths]
+    if isinstance(improvements, str):
+        improvements = [improvements]
+    
+    return {
+        "score": score,
+        "strengths": [str(s) for s in strengths] or ["Clear communication", "Good attempt"],
+        "improvements": [str(i) for i in improvements] or ["Add more technical details", "Be more specific"],
+        "feedback": str(raw.get("feedback") or "") or "Good effort. Consider providing more specific technical details and examples to improve your answer."
+    }
+
+def request_evaluation(question, answer, placeholder=None):
+    """Ask GPT to score one answer; raises on failure"""
+    # Only the user message varies, so the long system prompt is served from OpenAI's prompt cache
+    request = dict(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": EVALUATION_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt_prefix(question['id']) + f"\nSTUDENT'S ANSWER: {answer}"}
+        ],
+        temperature=0.7,
+        max_tokens=400,
+        response_format={"type": "json_object"},
+        extra_body={"prompt_cache_key": EVALUATION_CACHE_KEY}
+    )
+    
+    get_request_throttle().acquire()
+    if placeholder is not None:
+        stream = get_openai_client(api_key).chat.completions.create(**request, stream=True)
+        response_text = placeholder.write_stream(
+            chunk.choices[0].delta.content for chunk in stream
+            if chunk.choices and chunk.choices[0].delta.content
+        )
+    else:
+        response = get_openai_client(api_key).chat.completions.create(**request)
+        response_text = response.choices[0].message.content
+    
+    return normalize_feedback(load_json(response_text))
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def evaluation_cache():
+    """Parsed GPT evaluations keyed by (qid, answer hash), shared across sessions for an hour"""
+    return {}
+
+def evaluate_with_gpt(question, answer, placeholder=None):
+    """Evaluate answer using GPT, streaming the response into placeholder if given"""
     if not st.session_state.api_configured:
-        return get_demo_feedback(question)
+        return get_demo_feedback_cached(question['id'])
+    
+    # Only the parsed result is cached; streaming into placeholder always happens live
+    cache_key = (question['id'], answer_digest(answer))
+    cache = evaluation_cache()
+    if cache_key in cache:
+        return dict(cache[cache_key])
     
     try:
-        prompt = f"""
-        You are a technical interview evaluator. Evaluate this answer for an interview question.
-        
-        QUESTION: {question['question']}
-        CATEGORY: {question['category']}
-        DIFFICULTY: {question['difficulty']}
-        KEY CONCEPTS: {', '.join(question['keywords'])}
-        
-        STUDENT'S ANSWER: {answer}
-        
-        Provide a SINGLE overall score from 0-100 based on:
-        1. Technical accuracy and correctness
-        2. Completeness - covering all key concepts
-        3. Clarity and organization
-        4. Depth of understanding
-        5. Conciseness - appropriate length
-        
-        Scoring guidelines:
-        - 90-100: Excellent - Comprehensive, accurate, well-structured
-        - 80-89: Very Good - Solid understanding, minor improvements needed
-        - 70-79: Good - Understands concepts, needs more depth
-        - 60-69: Satisfactory - Basic understanding, some gaps
-        - 50-59: Needs Work - Significant gaps or inaccuracies
-        - Below 50: Poor - Major issues or incomplete
-        
-        Provide evaluation in this exact format:
-        SCORE: [single number 0-100]
-        STRENGTHS: [2-3 specific strengths]
-        IMPROVEMENTS: [2-3 specific areas for improvement]
-        FEEDBACK: [3-4 sentences with specific feedback]
-        
-        Be honest and realistic in scoring. A poor answer should get a low score.
-        """
+        feedback = request_evaluation(question, answer, placeholder)
+    except Exception as e:
+        st.error(f"GPT Evaluation error: {str(e)[:100]}")
+        return get_demo_feedback_cached(question['id'])
+    
+    cache[cache_key] = feedback
+    return dict(feedback)
+
+def evaluate_batch(pairs):
+    """Evaluate several (question, answer) pairs with a single GPT request"""
+    if not pairs:
+        return []
+    if not st.session_state.api_configured:
+        return [get_demo_feedback_cached(question['id']) for question, _ in pairs]
+    
+    try:
+        prompt = f'Evaluate each of the following {len(pairs)} numbered answers and respond with the "evaluations" array format.\n\n' + "\n\n".join(
+            f"ANSWER {i}\n{prompt_prefix(question['id'])}\nSTUDENT'S ANSWER: {answer}"
+            for i, (question, answer) in enumerate(pairs, 1)
+        )
         
-        response = st.session_state.openai_client.chat.completions.create(
+        get_request_throttle().acquire()
+        response = get_openai_client(api_key).chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
-                {"role": "system", "content": "You are a realistic technical interviewer. Score honestly based on answer quality."},
+                {"role": "system", "content": EVALUATION_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=500
+            max_tokens=min(400 * len(pairs), 4096),
+            response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": EVALUATION_CACHE_KEY}
         )
         
-        response_text = response.choices[0].message.content
-        
-        result = {
-            "score": 50,  # Default score
-            "strengths": [],
-            "improvements": [],
-            "feedback": ""
-        }
+        evaluations = load_json(response.choices[0].message.content).get("evaluations", [])
         
-        lines = response_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('SCORE:'):
-                try:
-                    score_text = line.replace('SCORE:', '').strip()
-                    result["score"] = int(score_text)
-                except:
-                    result["score"] = 50
-            elif line.startswith('STRENGTHS:'):
-                strengths_text = line.replace('STRENGTHS:', '').strip()
-                result["strengths"] = [s.strip() for s in strengths_text.split(',') if s.strip()]
-            elif line.startswith('IMPROVEMENTS:'):
-                improvements_text = line.replace('IMPROVEMENTS:', '').strip()
-                result["improvements"] = [i.strip() for i in improvements_text.split(',') if i.strip()]
-            elif line.startswith('FEEDBACK:'):
-                feedback_text = line.replace('FEEDBACK:', '').strip()
-                result["feedback"] = feedback_text
+        items = [item for item in evaluations if isinstance(item, dict)]
         
-        if not result["strengths"]:
-            result["strengths"] = ["Clear communication", "Good attempt"]
-        if not result["improvements"]:
-            result["improvements"] = ["Add more technical details", "Be more specific"]
-        if not result["feedback"]:
-            result["feedback"] = "Good effort. Consider providing more specific technical details and examples to improve your answer."
-        
-        return result
+        # Match on the echoed index; the model doesn't always keep the answers' order
+        by_index = {}
+        for item in items:
+            try:
+                by_index[int(item.get("index"))] = item
+            except (TypeError, ValueError):
+                pass
+        if not by_index and len(items) == len(pairs):
+            by_index = dict(enumerate(items, 1))
+        
+        # Answers the model skipped get demo feedback, so they aren't saved as real scores
+        return [
+            normalize_feedback(by_index[i]) if i in by_index else get_demo_feedback_cached(question['id'])
+            for i, (question, _) in enumerate(pairs, 1)
+        ]
     
     except Exception as e:
-        st.error(f"GPT Evaluation error: {str(e)[:100]}")
-        return get_demo_feedback(question)
+        st.error(f"GPT Batch evaluation error: {str(e)[:100]}")
+        return [get_demo_feedback_cached(question['id']) for question, _ in pairs]
 
-def get_demo_feedback(question):
-    """Return demo feedback when in demo mode"""
-    category = question['category']
-    difficulty = question['difficulty']
+def evaluate_many(pairs, max_workers=8):
+    """Evaluate {qid: (question, answer)} concurrently, one GPT request per answer"""
+    return map_in_threads(evaluate_with_gpt, pairs, max_workers)
+
+# Answers per combined evaluation request; larger batches risk truncated JSON
+EVAL_BATCH_SIZE = 5
+
+def evaluate_pending(pairs, batch_size=EVAL_BATCH_SIZE, max_workers=8):
+    """Evaluate {qid: (question, answer)} in combined requests sent in parallel"""
+    qids = list(pairs)
+    chunks = {
+        start: ([pairs[qid] for qid in qids[start:start + batch_size]],)
+        for start in range(0, len(qids), batch_size)
+    }
     
-    if difficulty == "Easy":
-        base_score = random.randint(70, 90)
-    elif difficulty == "Medium":
-        base_score = random.randint(60, 80)
-    else:
-        base_score = random.randint(50, 70)
-    
-    if category == "Data Structures":
-        feedback = "Your understanding of data structures is basic. To improve, provide more specific examples and discuss time/space complexities."
-    elif category == "Algorithms":
-        feedback = "You explained the concept but need more detail. Add complexity analysis and implementation details."
-    elif category == "System Design":
-        feedback = "Good high-level thinking. Add more specific components, technologies, and scalability considerations."
-    elif category == "Behavioral":
-        feedback = "Good personal example. Use the STAR method more clearly and add specific outcomes/metrics."
-    else:
-        feedback = "Good attempt. Add more technical details and real-world applications."
+    results = {}
+    for start, chunk_results in map_in_threads(evaluate_batch, chunks, max_workers).items():
+        results.update(zip(qids[start:start + batch_size], chunk_results))
+    return results
+
+# Demo feedback by question category, and score ranges by difficulty
+_CATEGORY_FEEDBACK = {
+    "Data Structures": "Your understanding of data structures is basic. To improve, provide more specific examples and discuss time/space complexities.",
+    "Algorithms": "You explained the concept but need more detail. Add complexity analysis and implementation details.",
+    "System Design": "Good high-level thinking. Add more specific components, technologies, and scalability considerations.",
+    "Behavioral": "Good personal example. Use the STAR method more clearly and add specific outcomes/metrics.",
+}
+_DEFAULT_DEMO_FEEDBACK = "Good attempt. Add more technical details and real-world applications."
+_DIFFICULTY_SCORE_RANGE = {"Easy": (70, 90), "Medium": (60, 80)}
+_DEFAULT_SCORE_RANGE = (50, 70)
+
+def _get_demo_feedback_impl(question):
+    """Return demo feedback when in demo mode"""
+    low, high = _DIFFICULTY_SCORE_RANGE.get(question['difficulty'], _DEFAULT_SCORE_RANGE)
+    base_score = demo_rng().randint(low, high)
+    feedback = _CATEGORY_FEEDBACK.get(question['category'], _DEFAULT_DEMO_FEEDBACK)
     
     return {
         "score": base_score,
         "strengths": ["Clear explanation", "Good structure"],
         "improvements": ["Add more examples", "Be more concise"],
-        "feedback": feedback
+        "feedback": feedback,
+        "demo": True
     }
 
+def get_demo_feedback_cached(qid):
+    """Demo feedback for a question, fixed per qid within a session so repeat evaluations agree"""
+    cache = st.session_state.setdefault('demo_feedback', {})
+    if qid not in cache:
+        cache.setdefault(qid, _get_demo_feedback_impl(questions_by_id()[qid]))
+    return dict(cache[qid])
+
+# ========== PDF REPORT ==========
+# Typographic punctuation Whisper and GPT like to emit, mapped to latin-1 equivalents
+_PDF_TRANSLATION = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+    "\u2013": "-", "\u2014": "-", "\u2026": "...", "\u2022": "*"
+})
+
+def _pdf_text(text):
+    """Make user text printable with the latin-1 core fonts, replacing what can't be shown"""
+    return text.translate(_PDF_TRANSLATION).encode("latin-1", "replace").decode("latin-1")
+
+def _render_summary(pdf, progress, stats, mode):
+    """Write the report title, mode and progress summary"""
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(0, 10, "Tech Interview Practice Report", 0, 1, 'C')
+    pdf.ln(5)
+    
+    pdf.set_font("Arial", 'I', 10)
+    pdf.cell(0, 10, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1, 'R')
+    pdf.ln(10)
+    
+    pdf.set_font("Arial", '', 10)
+    pdf.cell(0, 10, f"Mode: {mode}", 0, 1)
+    pdf.ln(5)
+    
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(0, 10, "Progress Summary", 0, 1)
+    
+    summary = [
+        f"Total Questions: {len(QUESTIONS)}",
+        f"Questions Attempted: {len(progress.get('answers', {}))}",
+        f"Questions Evaluated: {len(progress['completed'])}",
+    ]
+    if stats['count']:
+        summary += [
+            f"Average Score: {stats['avg']:.1f}%",
+            f"Highest Score: {stats['max']}%",
+            f"Lowest Score: {stats['min']}%",
+        ]
+    pdf.set_font("Arial", '', 12)
+    pdf.multi_cell(0, 10, "\n".join(summary), new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(10)
+
+def _render_question(pdf, heading, status_line, answer_line, last_style):
+    """Write one question block, switching font only when the style changes; returns the last style"""
+    for style, size, text in (('B', 11, heading), ('I', 10, status_line), ('', 10, answer_line)):
+        if (style, size) != last_style:
+            pdf.set_font("Arial", style, size)
+            last_style = (style, size)
+        pdf.multi_cell(0, 8, text, new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(5)
+    return last_style
+
+def generate_pdf(progress, qids, question_lookup, stats, mode):
+    """Render the progress report for the answered qids and return it as PDF bytes"""
+    pdf = FPDF()
+    pdf.add_page()
+    _render_summary(pdf, progress, stats, mode)
+    
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(0, 10, "Question Details", 0, 1)
+    
+    # Build every block's text up front so the render loop only emits cells
+    blocks = []
+    for qid in qids:
+        question = question_lookup[int(qid)]
+        answer = progress['answers'][qid]
+        if qid in progress['completed']:
+            status_line = f"Score: {progress['scores'].get(qid, 0)}% | Category: {question['category']} | Difficulty: {question['difficulty']}"
+        else:
+            status_line = f"Status: Recorded (Not evaluated) | Category: {question['category']}"
+        truncated_answer = answer[:400] + "..." if len(answer) > 400 else answer
+        blocks.append((
+            _pdf_text(f"Question {qid}: {question['question']}"),
+            _pdf_text(status_line),
+            _pdf_text(f"Your Answer: {truncated_answer}")
+        ))
+    
+    last_style = None
+    for heading, status_line, answer_line in blocks:
+        last_style = _render_question(pdf, heading, status_line, answer_line, last_style)
+    
+    # Footer
+    pdf.set_font("Arial", 'I', 8)
+    pdf.cell(0, 10, "Generated by Tech Interview Practice Platform", 0, 1, 'C')
+    
+    # fpdf2 builds the document as a bytearray; no str round-trip is needed
+    return bytes(pdf.output())
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_executor():
+    """Single worker reserved for report PDFs so they never queue behind transcription or model loads"""
+    return ThreadPoolExecutor(max_workers=1)
+
+def start_pdf_render(progress, mode):
+    """Render the report PDF in the background; re-rendered only after progress changes"""
+    stats = progress_stats()
+    job = st.session_state.get('pdf_job')
+    # progress_stats() returns a new dict whenever an answer or score changes
+    if job is None or job[0] is not stats or job[1] != mode:
+        # The worker gets its own copy so later edits can't race with rendering
+        snapshot = {
+            'completed': list(progress['completed']),
+            'scores': dict(progress['scores']),
+            'answers': dict(progress['answers'])
+        }
+        args = (snapshot, list(answered_qids()), questions_by_id(), stats, mode)
+        job = st.session_state.pdf_job = (stats, mode, get_pdf_executor().submit(generate_pdf, *args), args)
+    return job[2]
+
+def finish_pdf_render(timeout=5):
+    """PDF bytes from the background render, rendering here instead if it isn't ready in time"""
+    _, _, future, args = st.session_state.pdf_job
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        return generate_pdf(*args)
+
 # ========== PAGE FUNCTIONS ==========
+def go_to_page(page):
+    """Button callback: switch pages before the rerun the click already triggers"""
+    st.session_state.page = page
+
 def show_practice():
     st.title("📝 Practice Questions")
     
     if not st.session_state.api_configured:
         st.info("ℹ️ **Demo Mode Active** - Using simulated AI responses. Add OpenAI API key to enable real AI features.")
     
-    question_options = [f"Q{q['id']}: {q['question'][:50]}..." for q in QUESTIONS]
+    question_options = question_option_labels()
     selected_index = st.selectbox(
         "Choose a question:",
         range(len(QUESTIONS)),
@@ -657,18 +1159,34 @@ def show_practice():
     
     # Initialize session state keys if they don't exist
     if transcript_key not in st.session_state:
-        st.session_state[transcript_key] = ""
+        st.session_state[track_question_key(qid, transcript_key)] = ""
     if text_answer_key not in st.session_state:
-        st.session_state[text_answer_key] = existing_answer
+        st.session_state[track_question_key(qid, text_answer_key)] = existing_answer
     if last_audio_key not in st.session_state:
-        st.session_state[last_audio_key] = None
+        st.session_state[track_question_key(qid, last_audio_key)] = None
     
     # Show audio recording section
     st.divider()
     
-    if not st.session_state.api_configured:
-        st.info("🎤 **Voice recording requires OpenAI API key** to enable voice features.")
+    if not (st.session_state.api_configured or local_whisper_available):
+        st.info("🎤 **Voice recording requires OpenAI API key** (or `faster-whisper` installed) to enable voice features.")
     else:
+        # Recordings from any question that were never transcribed
+        pending_audio = pending_audio_qids()
+        if pending_audio:
+            if st.button(f"🎤 Transcribe All Pending ({len(pending_audio)})", 
+                        key="transcribe_all_pending", 
+                        use_container_width=True,
+                        help="Transcribe every recorded answer that has no transcript yet"):
+                with st.spinner("Transcribing recorded answers..."):
+                    audio_blobs = {pending_qid: st.session_state[f'last_audio_{pending_qid}'] for pending_qid in pending_audio}
+                    for pending_qid, transcript in transcribe_audio_batch(audio_blobs).items():
+                        if transcript:
+                            st.session_state[f'audio_transcript_{pending_qid}'] = transcript
+                            st.session_state[f'text_answer_{pending_qid}'] = transcript
+                            save_answer(pending_qid, transcript)
+                st.rerun()
+        
         # Use custom audio recorder component
         audio_recorder_component(question['id'])
         
@@ -690,14 +1208,15 @@ def show_practice():
                            type="primary"):
                     with st.spinner("Transcribing audio..."):
                         try:
-                            transcript = transcribe_audio(
-                                st.session_state[last_audio_key], 
-                                question['id']
+                            transcript = resolve_transcription(
+                                qid, 
+                                st.session_state[last_audio_key],
+                                placeholder=st.empty()
                             )
                             if transcript:
                                 st.session_state[transcript_key] = transcript
                                 st.session_state[text_answer_key] = transcript
-                                progress['answers'][qid] = transcript
+                                save_answer(qid, transcript)
                                 st.success("✅ Transcription complete and saved!")
                                 st.rerun()
                         except Exception as e:
@@ -705,20 +1224,17 @@ def show_practice():
                             demo_transcript = get_question_demo_transcript(question['id'])
                             st.session_state[transcript_key] = demo_transcript
                             st.session_state[text_answer_key] = demo_transcript
-                            progress['answers'][qid] = demo_transcript
+                            save_answer(qid, demo_transcript)
                             st.info("Using demo transcription. Check your API key and try again.")
                             st.rerun()
             
             with col_trans2:
-                if st.button("🗑️ Remove Audio", 
-                           key=f"remove_audio_{qid}",
-                           help="Remove audio and start over",
-                           use_container_width=True):
-                    st.session_state[last_audio_key] = None
-                    if f'recording_active_{qid}' in st.session_state:
-                        st.session_state[f'recording_active_{qid}'] = False
-                    st.success("Audio removed. You can record again.")
-                    st.rerun()
+                st.button("🗑️ Remove Audio", 
+                        key=f"remove_audio_{qid}",
+                        help="Remove audio and start over",
+                        use_container_width=True,
+                        on_click=discard_audio,
+                        args=(qid,))
             
             # Show existing transcript if available
             if st.session_state[transcript_key]:
@@ -728,7 +1244,7 @@ def show_practice():
                     "Transcribed Text",
                     st.session_state[transcript_key],
                     height=150,
-                    key=f"transcript_display_{qid}",
+                    key=track_question_key(qid, f"transcript_display_{qid}"),
                     disabled=True
                 )
     
@@ -737,12 +1253,12 @@ def show_practice():
     
     # Save answer to progress when user transcribes
     if final_answer and final_answer != existing_answer:
-        progress['answers'][qid] = final_answer
+        save_answer(qid, final_answer)
     
-    # Word count display
+    # Word count display (final_answer was saved to progress just above)
+    answer_words = progress_stats()['word_counts'].get(qid, 0) if final_answer else 0
     if final_answer:
-        word_count = len(final_answer.split())
-        st.caption(f"📊 Word count: {word_count} (Ideal: {question['ideal_length']})")
+        st.caption(f"📊 Word count: {answer_words} (Ideal: {question['ideal_length']})")
     
     # EVALUATE BUTTON SECTION
     st.divider()
@@ -764,40 +1280,24 @@ def show_practice():
     
     # Show evaluation section
     if final_answer and final_answer.strip():
-        word_count = len(final_answer.split())
-        st.success(f"✅ **Answer ready for evaluation** ({word_count} words)")
+        st.success(f"✅ **Answer ready for evaluation** ({answer_words} words)")
         
         # Evaluation button
         if st.button("✅ Evaluate Answer", 
                     key=f"eval_{qid}", 
                     type="primary", 
                     use_container_width=True):
-            with st.spinner("🔍 Analyzing your answer..."):
-                progress['answers'][qid] = final_answer
-                
-                # Get AI evaluation (single score only)
-                ai_eval = evaluate_with_gpt(question, final_answer)
-                
-                # Use the AI score as the overall score
-                overall_score = ai_eval['score']
-                
-                # Update progress
-                if qid not in progress['completed']:
-                    progress['completed'].append(qid)
-                progress['scores'][qid] = overall_score
-                
-                # Store evaluation details
-                eval_data = {
-                    'overall_score': overall_score,
-                    'word_count': word_count,
-                    'feedback': ai_eval
-                }
-                
-                st.session_state[evaluation_key] = eval_data
-                progress['evaluations'][qid] = eval_data
-                
-                show_evaluation = True
-                st.success("✅ Evaluation Complete!")
+            if eval_data and eval_data.get('answer_hash') == answer_digest(final_answer):
+                # Same text as the saved evaluation, so there is nothing new to score
+                st.toast("Answer unchanged since the last evaluation - showing the saved result.")
+            else:
+                with st.status("🔍 Analyzing your answer...", expanded=True) as status:
+                    # Get AI evaluation (single score only), streamed into the status box
+                    ai_eval = evaluate_with_gpt(question, final_answer, placeholder=st.empty())
+                    eval_data = record_evaluation(qid, final_answer, ai_eval)
+                    
+                    show_evaluation = True
+                    status.update(label="✅ Evaluation Complete!", state="complete")
                 st.rerun()
         
         # Show evaluation results if available
@@ -851,13 +1351,12 @@ def show_practice():
     
     # Reset button for this question
     st.divider()
-    if st.button("🔄 Reset This Question", 
-                key=f"reset_question_full_{qid}", 
-                use_container_width=True, 
-                type="secondary"):
-        if clear_question_data(qid):
-            st.success(f"Question {qid} reset successfully!")
-            st.rerun()
+    st.button("🔄 Reset This Question", 
+             key=f"reset_question_full_{qid}", 
+             use_container_width=True, 
+             type="secondary",
+             on_click=reset_question,
+             args=(qid,))
 
 def show_home():
     st.title("💻 Ai Interview Practice Platform")
@@ -894,9 +1393,11 @@ def show_home():
         **Your progress is automatically saved!** You can return anytime.
         """)
         
-        if st.button("🎯 Start Practicing Now", type="primary", use_container_width=True):
-            st.session_state.page = "practice"
-            st.rerun()
+        st.button("🎯 Start Practicing Now", 
+                 type="primary", 
+                 use_container_width=True,
+                 on_click=go_to_page,
+                 args=("practice",))
     
     with col2:
         # API Status Card
@@ -921,9 +1422,9 @@ def show_home():
         st.divider()
         
         # Progress stats
-        progress = st.session_state.progress
-        attempted = len(progress.get('answers', {}))
-        completed = len(progress['completed'])
+        agg = st.session_state.progress['_agg']
+        attempted = agg['attempted']
+        completed = agg['completed']
         
         st.write("**Your Progress:**")
         col_stat1, col_stat2 = st.columns(2)
@@ -937,10 +1438,117 @@ def show_home():
             st.progress(progress_value)
         
         # Quick stats
-        if progress['scores']:
-            avg_score = sum(progress['scores'].values()) / len(progress['scores'])
+        if agg['count']:
+            avg_score = agg['total'] / agg['count']
             st.write(f"**Average Score:** {avg_score:.1f}%")
 
+@st.fragment
+def _render_pending_evaluation():
+    """Evaluate every recorded answer that has no score yet; toggling the mode reruns only this section"""
+    progress = st.session_state.progress
+    pending_qids = [qid for qid in progress.get('answers', {}) if qid not in progress['completed']]
+    if pending_qids:
+        col_eval1, col_eval2 = st.columns([2, 1])
+        with col_eval2:
+            evaluate_separately = st.checkbox(
+                "Evaluate each answer separately",
+                help="Send one request per answer in parallel instead of a single combined request"
+            )
+        with col_eval1:
+            evaluate_all = st.button(f"✅ Evaluate All Pending ({len(pending_qids)})", 
+                                    type="primary", 
+                                    use_container_width=True)
+        
+        if evaluate_all:
+            with st.spinner("🔍 Analyzing your answers..."):
+                question_lookup = questions_by_id()
+                pairs = {qid: (question_lookup[int(qid)], progress['answers'][qid]) for qid in pending_qids}
+                if evaluate_separately:
+                    results = evaluate_many(pairs)
+                else:
+                    results = evaluate_pending(pairs)
+                for qid, ai_eval in results.items():
+                    record_evaluation(qid, progress['answers'][qid], ai_eval)
+            st.rerun()
+
+@st.fragment
+def _render_quick_actions():
+    """Navigation buttons at the bottom of the dashboard"""
+    st.divider()
+    col_act1, col_act2, col_act3 = st.columns(3)
+    with col_act1:
+        if st.button("📝 Practice More", use_container_width=True):
+            st.session_state.page = "practice"
+            st.rerun()
+    
+    with col_act2:
+        if st.button("📄 Generate Report", use_container_width=True):
+            st.session_state.page = "report"
+            st.rerun()
+    
+    with col_act3:
+        if st.button("🏠 Go Home", use_container_width=True):
+            st.session_state.page = "home"
+            st.rerun()
+
+def _render_status_table(progress):
+    """One row per question with its status and score, sent as a single dataframe"""
+    st.subheader("📋 Question Status")
+    
+    excerpts = question_excerpts()
+    rows = []
+    for question in QUESTIONS:
+        qid = str(question['id'])
+        if qid in progress['completed']:
+            status = "✅ Completed"
+        elif qid in progress.get('answers', {}):
+            status = "🎤 Recorded"
+        else:
+            status = "⏳ Not Attempted"
+        rows.append({
+            "Q": f"Q{qid}",
+            "Question": excerpts[question['id']][70],
+            "Status": status,
+            "Score": progress['scores'].get(qid)
+        })
+    
+    st.dataframe(
+        rows,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Score": st.column_config.ProgressColumn("Score", format="%d%%", min_value=0, max_value=100)
+        }
+    )
+
+def _render_history(progress):
+    """Expanders for the three highest-numbered answered questions"""
+    if progress.get('answers'):
+        st.subheader("📝 Answer History")
+        question_lookup = questions_by_id()
+        
+        for qid in answered_qids()[:-4:-1]:
+            with st.expander(f"Question {qid} - {question_excerpts()[int(qid)][50]}"):
+                question = question_lookup[int(qid)]
+                st.write(f"**Question:** {question['question']}")
+                st.write(f"**Category:** {question['category']} | **Difficulty:** {question['difficulty']}")
+                
+                answer = progress['answers'][qid]
+                st.write(f"**Your Answer:** {answer[:300]}...")
+                
+                if qid in progress['completed']:
+                    score = progress['scores'].get(qid, 0)
+                    st.write(f"**Score:** {score}%")
+                    
+                    if qid in progress.get('evaluations', {}):
+                        eval_data = progress['evaluations'][qid]
+                        st.write(f"**Word Count:** {eval_data['word_count']}")
+                else:
+                    st.warning("Answer recorded but not evaluated yet")
+        
+        if len(progress['answers']) > 3:
+            st.info(f"... and {len(progress['answers']) - 3} more answers")
+
 def show_dashboard():
     st.title("📊 Progress Dashboard")
     
@@ -961,8 +1569,10 @@ def show_dashboard():
         st.progress(progress_value)
     
     with col3:
-        if progress['scores']:
-            avg_score = sum(progress['scores'].values()) / len(progress['scores'])
+        avg_score, scored = progress_store(get_session_id()).execute(
+            "SELECT AVG(score), COUNT(score) FROM eval"
+        ).fetchone()
+        if scored:
             st.metric("Average Score", f"{avg_score:.1f}%")
         else:
             st.metric("Average Score", "0%")
@@ -977,98 +1587,14 @@ def show_dashboard():
         else:
             st.metric("Last Score", "N/A")
     
-    st.divider()
-    st.subheader("📋 Question Status")
-    
-    # Create a table-like display
-    for question in QUESTIONS:
-        qid = str(question['id'])
-        completed = qid in progress['completed']
-        attempted = qid in progress.get('answers', {})
-        score = progress['scores'].get(qid, 0)
-        
-        # Create status indicator
-        if completed:
-            status = "✅ Completed"
-            score_display = f"{score}%"
-            status_color = "green"
-        elif attempted:
-            status = "🎤 Recorded"
-            score_display = "Pending"
-            status_color = "blue"
-        else:
-            status = "⏳ Not Attempted"
-            score_display = "-"
-            status_color = "gray"
-        
-        # Display in columns
-        col1, col2, col3, col4 = st.columns([1, 3, 2, 2])
-        
-        with col1:
-            st.write(f"**Q{qid}**")
-        
-        with col2:
-            st.write(f"{question['question'][:70]}...")
-        
-        with col3:
-            st.markdown(f"<span style='color:{status_color}'>{status}</span>", unsafe_allow_html=True)
-        
-        with col4:
-            if completed:
-                st.success(score_display)
-            elif attempted:
-                st.info(score_display)
-            else:
-                st.write(score_display)
+    _render_pending_evaluation()
     
     st.divider()
-    
-    # Show detailed answer history
-    if progress.get('answers'):
-        st.subheader("📝 Answer History")
-        sorted_qids = sorted(progress['answers'].keys(), 
-                           key=lambda x: int(x), 
-                           reverse=True)
-        
-        for qid in sorted_qids[:3]:
-            with st.expander(f"Question {qid} - {QUESTIONS[int(qid)-1]['question'][:50]}..."):
-                question = QUESTIONS[int(qid)-1]
-                st.write(f"**Question:** {question['question']}")
-                st.write(f"**Category:** {question['category']} | **Difficulty:** {question['difficulty']}")
-                
-                answer = progress['answers'][qid]
-                st.write(f"**Your Answer:** {answer[:300]}...")
-                
-                if qid in progress['completed']:
-                    score = progress['scores'].get(qid, 0)
-                    st.write(f"**Score:** {score}%")
-                    
-                    if qid in progress.get('evaluations', {}):
-                        eval_data = progress['evaluations'][qid]
-                        st.write(f"**Word Count:** {eval_data['word_count']}")
-                else:
-                    st.warning("Answer recorded but not evaluated yet")
-        
-        if len(progress['answers']) > 3:
-            st.info(f"... and {len(progress['answers']) - 3} more answers")
-    
-    # Quick action buttons
+    _render_status_table(progress)
     st.divider()
-    col_act1, col_act2, col_act3 = st.columns(3)
-    with col_act1:
-        if st.button("📝 Practice More", use_container_width=True):
-            st.session_state.page = "practice"
-            st.rerun()
+    _render_history(progress)
     
-    with col_act2:
-        if st.button("📄 Generate Report", use_container_width=True):
-            st.session_state.page = "report"
-            st.rerun()
-    
-    with col_act3:
-        if st.button("🏠 Go Home", use_container_width=True):
-            st.session_state.page = "home"
-            st.rerun()
+    _render_quick_actions()
 
 def show_report():
     st.title("📄 Generate Report")
@@ -1077,91 +1603,15 @@ def show_report():
     
     if not progress.get('answers'):
         st.warning("Record at least one answer to generate a report")
-        if st.button("📝 Go Practice", use_container_width=True):
-            st.session_state.page = "practice"
-            st.rerun()
+        st.button("📝 Go Practice", 
+                 use_container_width=True,
+                 on_click=go_to_page,
+                 args=("practice",))
         return
     
-    def generate_pdf():
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Title
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(0, 10, "Tech Interview Practice Report", 0, 1, 'C')
-        pdf.ln(5)
-        
-        # Date
-        pdf.set_font("Arial", 'I', 10)
-        pdf.cell(0, 10, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1, 'R')
-        pdf.ln(10)
-        
-        # Mode info
-        pdf.set_font("Arial", '', 10)
-        mode = "Demo Mode" if not st.session_state.api_configured else "Real AI Mode"
-        pdf.cell(0, 10, f"Mode: {mode}", 0, 1)
-        pdf.ln(5)
-        
-        # Progress Summary
-        pdf.set_font("Arial", 'B', 14)
-        pdf.cell(0, 10, "Progress Summary", 0, 1)
-        pdf.set_font("Arial", '', 12)
-        
-        completed = len(progress['completed'])
-        attempted = len(progress.get('answers', {}))
-        pdf.cell(0, 10, f"Total Questions: {len(QUESTIONS)}", 0, 1)
-        pdf.cell(0, 10, f"Questions Attempted: {attempted}", 0, 1)
-        pdf.cell(0, 10, f"Questions Evaluated: {completed}", 0, 1)
-        
-        if progress['scores']:
-            avg_score = sum(progress['scores'].values()) / len(progress['scores'])
-            highest = max(progress['scores'].values()) if progress['scores'] else 0
-            lowest = min(progress['scores'].values()) if progress['scores'] else 0
-            
-            pdf.cell(0, 10, f"Average Score: {avg_score:.1f}%", 0, 1)
-            pdf.cell(0, 10, f"Highest Score: {highest}%", 0, 1)
-            pdf.cell(0, 10, f"Lowest Score: {lowest}%", 0, 1)
-        
-        pdf.ln(10)
-        
-        # Question Details
-        pdf.set_font("Arial", 'B', 14)
-        pdf.cell(0, 10, "Question Details", 0, 1)
-        pdf.set_font("Arial", '', 10)
-        
-        for qid in sorted(progress.get('answers', {}).keys(), key=int):
-            question = QUESTIONS[int(qid)-1]
-            answer = progress['answers'][qid]
-            
-            pdf.set_font("Arial", 'B', 11)
-            pdf.multi_cell(0, 8, f"Question {qid}: {question['question']}")
-            
-            pdf.set_font("Arial", 'I', 10)
-            if qid in progress['completed']:
-                score = progress['scores'].get(qid, 0)
-                pdf.cell(0, 8, f"Score: {score}% | Category: {question['category']} | Difficulty: {question['difficulty']}", 0, 1)
-            else:
-                pdf.cell(0, 8, f"Status: Recorded (Not evaluated) | Category: {question['category']}", 0, 1)
-            
-            pdf.set_font("Arial", '', 10)
-            truncated_answer = answer[:400] + "..." if len(answer) > 400 else answer
-            pdf.multi_cell(0, 8, f"Your Answer: {truncated_answer}")
-            pdf.ln(5)
-        
-        # Footer
-        pdf.set_font("Arial", 'I', 8)
-        pdf.cell(0, 10, "Generated by Tech Interview Practice Platform", 0, 1, 'C')
-        
-        # FIX: Handle bytearray properly
-        pdf_output = pdf.output(dest='S')
-        
-        # Check if output is bytearray or bytes
-        if isinstance(pdf_output, bytearray):
-            return bytes(pdf_output)
-        elif isinstance(pdf_output, str):
-            return pdf_output.encode('latin-1')
-        else:
-            return pdf_output
+    # Start building the PDF now so it is ready by the time Download is clicked
+    mode = "Demo Mode" if not st.session_state.api_configured else "Real AI Mode"
+    start_pdf_render(progress, mode)
     
     # Report Preview
     st.subheader("Report Preview")
@@ -1181,32 +1631,22 @@ def show_report():
         st.progress(progress_value)
         
         st.write("**Attempted Questions:**")
-        for qid in sorted(progress.get('answers', {}).keys(), key=int):
-            question = QUESTIONS[int(qid)-1]
+        for qid in answered_qids():
             status = "✅ Evaluated" if qid in progress['completed'] else "🎤 Recorded"
             score_display = f" ({progress['scores'].get(qid, 0)}%)" if qid in progress['completed'] else ""
-            st.write(f"• Q{qid}: {question['question'][:40]}... {status}{score_display}")
+            st.write(f"• Q{qid}: {question_excerpts()[int(qid)][40]} {status}{score_display}")
     
     with col2:
-        if progress['scores']:
-            avg_score = sum(progress['scores'].values()) / len(progress['scores'])
-            highest = max(progress['scores'].values()) if progress['scores'] else 0
-            lowest = min(progress['scores'].values()) if progress['scores'] else 0
-            
-            st.metric("Average Score", f"{avg_score:.1f}%")
-            st.metric("Highest Score", f"{highest}%")
-            st.metric("Lowest Score", f"{lowest}%")
+        stats = progress_stats()
+        if stats['count']:
+            st.metric("Average Score", f"{stats['avg']:.1f}%")
+            st.metric("Highest Score", f"{stats['max']}%")
+            st.metric("Lowest Score", f"{stats['min']}%")
             
             # Score distribution
-            scores_list = list(progress['scores'].values())
-            if scores_list:
-                st.write("**Score Distribution:**")
-                for range_start in range(0, 100, 20):
-                    range_end = range_start + 20
-                    count = sum(1 for s in scores_list if range_start <= s < range_end)
-                    if range_end == 100:
-                        count = sum(1 for s in scores_list if s >= 90)
-                    st.write(f"{range_start}-{range_end}%: {count} questions")
+            st.write("**Score Distribution:**")
+            for range_start, count in zip(SCORE_BINS, stats['distribution']):
+                st.write(f"{range_start}-{range_start + 20}%: {count} questions")
         elif progress.get('answers'):
             st.info("### 📊 Scores")
             st.write("Complete evaluation to see scores")
@@ -1223,7 +1663,7 @@ def show_report():
     if st.button("📥 Generate & Download PDF Report", type="primary", use_container_width=True):
         with st.spinner("Generating PDF report..."):
             try:
-                pdf_bytes = generate_pdf()
+                pdf_bytes = finish_pdf_render()
                 
                 # Create download button
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -1245,6 +1685,11 @@ def main():
     if 'page' not in st.session_state:
         st.session_state.page = "home"
     
+    # Load the model while the user is still on the home page, not on their first recording
+    # (the API key check in validate_api_key already opens the OpenAI connection)
+    if local_whisper_available:
+        warm_up_local_whisper()
+    
     show_sidebar()
     
     current_page = st.session_state.page